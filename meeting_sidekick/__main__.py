@@ -4,16 +4,20 @@ Main entry point for the Meeting Sidekick application.
 
 import os
 import click
-from rich.console import Console
-from rich.prompt import Prompt
 
-from .audio.recorder import SpeechRecognizer
-from .processing.assistant import MeetingAssistant
-from .ui.cli import MeetingSidekickCLI
-from .ui.notifications import NotificationManager
 from .utils.config import Config
 
-console = Console()
+# Rich, Whisper and OpenAI are slow to import, so they are only loaded by
+# the commands that need them; `--help` stays fast
+_console = None
+
+def get_console():
+    """Get the shared Rich console, creating it on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
 
 @click.group()
 def cli():
@@ -25,6 +29,15 @@ def cli():
 @click.option('--whisper-model', default='base', help='Whisper model to use for transcription')
 def run(api_key, whisper_model):
     """Run the Meeting Sidekick application"""
+    from rich.prompt import Prompt
+    
+    from .audio.recorder import SpeechRecognizer
+    from .processing.assistant import MeetingAssistant
+    from .ui.cli import MeetingSidekickCLI
+    from .ui.notifications import NotificationManager
+    
+    console = get_console()
+    
     # Load configuration
     config = Config()
     
@@ -64,6 +77,9 @@ def run(api_key, whisper_model):
         # Initialize CLI
         console.print("Setting up interface...")
         cli_app = MeetingSidekickCLI(recorder, assistant)
+        # Summary and action items are fetched together, so refresh both at the shorter interval
+        cli_app.update_interval = min(config.get('summary_update_interval', 25),
+                                      config.get('action_items_update_interval', 50))
         
         # Add notification integration
         def on_insight(insights):
@@ -84,6 +100,9 @@ def run(api_key, whisper_model):
 @cli.command()
 def setup():
     """Set up Meeting Sidekick configuration"""
+    from rich.prompt import Prompt
+    
+    console = get_console()
     config = Config()
     
     console.print("[bold blue]Meeting Sidekick Setup[/bold blue]")
@@ -113,9 +132,9 @@ def main():
     try:
         cli()
     except KeyboardInterrupt:
-        console.print("\n[bold yellow]Meeting Sidekick terminated by user.[/bold yellow]")
+        get_console().print("\n[bold yellow]Meeting Sidekick terminated by user.[/bold yellow]")
     except Exception as e:
-        console.print(f"\n[bold red]An error occurred:[/bold red] {e}")
+        get_console().print(f"\n[bold red]An error occurred:[/bold red] {e}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,48 @@
+"""
+Compiled audio kernels for the speech recognizer hot path.
+Uses Numba when it is installed and falls back to NumPy otherwise.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def int16_to_float_and_stats(src, dst):
+        """
+        Convert int16 samples to float32 in [-1, 1) and measure their level in one pass.
+
+        Args:
+            src (np.ndarray): int16 samples
+            dst (np.ndarray): float32 output with the same length as src
+
+        Returns:
+            float: Mean absolute amplitude of the converted samples
+        """
+        n = src.size
+        s = 0.0
+        for i in range(n):
+            v = src[i] * (1.0 / 32768.0)
+            dst[i] = v
+            s += v if v >= 0 else -v
+        return s / n if n else 0.0
+else:
+    def int16_to_float_and_stats(src, dst):
+        """
+        Convert int16 samples to float32 in [-1, 1) and measure their level.
+
+        Args:
+            src (np.ndarray): int16 samples
+            dst (np.ndarray): float32 output with the same length as src
+
+        Returns:
+            float: Mean absolute amplitude of the converted samples
+        """
+        if not src.size:
+            return 0.0
+        np.multiply(src, np.float32(1 / 32768.0), out=dst)
+        return float(np.abs(dst).mean())
@@ -0,0 +1,66 @@
+"""
+Local Agreement policy for streaming Whisper transcription.
+Commits only the words that two consecutive hypotheses of the same audio agree on.
+Decodes can split the same audio into a different number of words and shift word
+timings by tens of milliseconds, so a word counts as already committed when its
+midpoint falls before the end of the last committed word.
+"""
+
+import string
+
+_STRIP_CHARS = string.punctuation + string.whitespace
+
+def _normalize(word):
+    """Normalize a word for comparison between hypotheses."""
+    return word.strip(_STRIP_CHARS).lower()
+
+class LocalAgreement:
+    def __init__(self):
+        """Initialize the policy for a new audio buffer."""
+        self.reset()
+
+    def reset(self):
+        """Forget all hypotheses, e.g. after the audio buffer was trimmed or flushed."""
+        self.committed = 0  # Number of words committed from the current buffer
+        self.committed_end = 0.0  # End time in seconds of the last committed word
+        self._previous = []
+
+    def update(self, words):
+        """
+        Compare a new hypothesis with the previous one and commit their common prefix.
+
+        Args:
+            words (list): (word, start_time, end_time, ...) tuples for the whole audio buffer
+
+        Returns:
+            list: Newly committed word tuples
+        """
+        agreed = 0
+        limit = min(len(words), len(self._previous))
+        while agreed < limit and _normalize(words[agreed][0]) == _normalize(self._previous[agreed][0]):
+            agreed += 1
+        self._previous = words
+
+        new_words = self._uncommitted(words[:agreed])
+        if new_words:
+            self.committed += len(new_words)
+            self.committed_end = new_words[-1][2]
+        return new_words
+
+    def flush(self, words):
+        """
+        Commit everything after the already-committed prefix, e.g. when the speech segment ends.
+
+        Args:
+            words (list): (word, start_time, end_time, ...) tuples for the whole audio buffer
+
+        Returns:
+            list: Newly committed word tuples
+        """
+        new_words = self._uncommitted(words)
+        self.reset()
+        return new_words
+
+    def _uncommitted(self, words):
+        """Return the words whose midpoint lies after the end of the last committed word."""
+        return [word for word in words if (word[1] + word[2]) / 2 > self.committed_end]
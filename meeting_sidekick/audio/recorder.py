@@ -1,10 +1,34 @@
+import os
 import pyaudio
 import numpy as np
-import whisper
+from faster_whisper import BatchedInferencePipeline, WhisperModel
 import threading
-from queue import Queue
+from concurrent.futures import ThreadPoolExecutor
 import time
 
+from ._kernels import int16_to_float_and_stats
+from .agreement import LocalAgreement
+from .ring import PCMRing
+
+try:
+    import torch
+except ImportError:
+    torch = None
+
+SAMPLE_RATE = 16000
+CHUNK_FRAMES = 4000
+CALLBACK_FRAMES = 1024
+RING_SECONDS = 30
+VAD_FRAME = 512  # Silero VAD expects 32 ms frames at 16 kHz
+VAD_THRESHOLD = 0.5
+MAX_SEGMENT_SECONDS = 15
+HOP_SECONDS = 1  # how often a partial hypothesis is decoded during speech
+CONTEXT_SECONDS = 10  # trim committed audio once the window grows past this
+PROMPT_CHARS = 200  # committed text passed back to Whisper as initial_prompt
+UNCERTAIN_PROBABILITY = 0.5  # segments below this mean word probability are kept for refinement
+MAX_UNCERTAIN_WINDOWS = 32
+BATCH_CLIP_SECONDS = 30  # Whisper's input length; bulk_transcribe pads each window to one clip
+
 class SpeechRecognizer:
     def __init__(self, model_name="base"):
         """
@@ -13,12 +37,66 @@ class SpeechRecognizer:
         Args:
             model_name (str): Whisper model name. Defaults to "base".
         """
-        self.audio_queue = Queue()
-        self.model = whisper.load_model(model_name)
+        # Lock-free hand-off from the capture thread to the processing thread
+        self._pcm = PCMRing(SAMPLE_RATE * RING_SECONDS)
+        self.model = WhisperModel(
+            model_name,
+            device="cpu",
+            compute_type="int8",
+            cpu_threads=max(1, (os.cpu_count() or 2) // 2)
+        )
+        # Single worker that owns all Whisper inference calls
+        self._infer_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="whisper")
+        self._batched = BatchedInferencePipeline(model=self.model)
         self.is_capturing = False
         self.transcription = []
+        self._prompt = ""  # tail of the committed transcript, used as Whisper's initial_prompt
+        self._uncertain = []  # (transcription index, audio) pairs worth re-decoding later
         self.new_transcription_callback = None
         
+        # Preallocated float32 audio window handed to Whisper by _process_audio
+        self._ringf = np.empty(SAMPLE_RATE * RING_SECONDS, dtype=np.float32)
+        
+        # Voice activity detector used to decide when to run Whisper
+        self.vad_model = self._load_vad()
+        
+        self._warm_up()
+        
+    def _load_vad(self):
+        """
+        Load the Silero VAD model.
+        
+        Returns:
+            The VAD model, or None if it is unavailable and the amplitude
+            gate should be used instead.
+        """
+        if torch is None:
+            return None
+        try:
+            model, _ = torch.hub.load('snakers4/silero-vad', 'silero_vad', trust_repo=True)
+            return model
+        except Exception as e:
+            print(f"Error loading Silero VAD, falling back to amplitude gate: {e}")
+            return None
+        
+    def _warm_up(self):
+        """Run each model and kernel once so the first real utterance doesn't pay start-up costs."""
+        silence = np.zeros(SAMPLE_RATE, dtype=np.float32)
+        int16_to_float_and_stats(np.zeros(CHUNK_FRAMES, dtype=np.int16), self._ringf[:CHUNK_FRAMES])
+        
+        try:
+            self._run_inference(silence)
+        except Exception:
+            pass
+            
+        if self.vad_model is not None:
+            try:
+                with torch.no_grad():
+                    self.vad_model(torch.from_numpy(silence[:VAD_FRAME]), SAMPLE_RATE)
+                self.vad_model.reset_states()
+            except Exception:
+                pass
+        
     def set_transcription_callback(self, callback):
         """
         Set a callback function that will be called with new transcription segments.
@@ -29,95 +107,338 @@ class SpeechRecognizer:
         self.new_transcription_callback = callback
         
     def start_capture(self):
-        """Start capturing and processing audio in separate threads."""
+        """Start capturing audio into the PCM ring and processing it in a separate thread."""
         if self.is_capturing:
             return
             
+        # The ring allows a single consumer, so a processing thread still finishing
+        # a decode from the previous session must exit before the ring is reused
+        previous = getattr(self, 'process_thread', None)
+        if previous is not None and previous.is_alive():
+            previous.join()
+            
+        self._pcm.clear()
         self.is_capturing = True
-        self.capture_thread = threading.Thread(target=self._capture_audio)
-        self.process_thread = threading.Thread(target=self._process_audio)
-        
-        self.capture_thread.daemon = True
-        self.process_thread.daemon = True
-        
-        self.capture_thread.start()
-        self.process_thread.start()
-        
-    def stop_capture(self):
-        """Stop capturing and processing audio."""
-        self.is_capturing = False
-        if hasattr(self, 'capture_thread'):
-            self.capture_thread.join(timeout=1.0)
-        if hasattr(self, 'process_thread'):
-            self.process_thread.join(timeout=1.0)
         
-    def _capture_audio(self):
-        """Capture audio from the microphone and add to the queue."""
-        # Set up audio capture with PyAudio
-        p = pyaudio.PyAudio()
+        # PortAudio's own audio thread pushes samples through _pa_callback,
+        # so no Python thread is needed for capture
+        self._pa = pyaudio.PyAudio()
         try:
-            stream = p.open(
+            self._stream = self._pa.open(
                 format=pyaudio.paInt16,
                 channels=1,
-                rate=16000,
+                rate=SAMPLE_RATE,
                 input=True,
-                frames_per_buffer=4000
+                frames_per_buffer=CALLBACK_FRAMES,
+                stream_callback=self._pa_callback
             )
+        except Exception:
+            self.is_capturing = False
+            self._pa.terminate()
+            raise
             
-            while self.is_capturing:
-                try:
-                    audio_chunk = stream.read(4000)
-                    self.audio_queue.put(audio_chunk)
-                except Exception as e:
-                    print(f"Error reading audio: {e}")
-                    time.sleep(0.1)
-        finally:
+        self.process_thread = threading.Thread(target=self._process_audio)
+        self.process_thread.daemon = True
+        self.process_thread.start()
+        self._stream.start_stream()
+        
+    def stop_capture(self):
+        """Stop capturing and processing audio."""
+        self.is_capturing = False
+        if hasattr(self, '_stream'):
             try:
-                stream.stop_stream()
-                stream.close()
+                self._stream.stop_stream()
+                self._stream.close()
             except:
                 pass
-            p.terminate()
+            self._pa.terminate()
+            del self._stream
+        if hasattr(self, 'process_thread'):
+            self.process_thread.join(timeout=1.0)
+        if self._pcm.overruns:
+            print(f"Warning: audio processing fell behind, dropped {self._pcm.overruns} buffers")
+        
+    def _pa_callback(self, in_data, frame_count, time_info, status):
+        """PyAudio stream callback that copies captured samples into the PCM ring."""
+        self._pcm.write(np.frombuffer(in_data, dtype=np.int16))
+        return (None, pyaudio.paContinue if self.is_capturing else pyaudio.paComplete)
         
     def _process_audio(self):
         """Process audio chunks for speech recognition using Whisper."""
-        buffer = []
-        silence_threshold = 0.01  # Adjust based on your environment
+        if self.vad_model is None:
+            self._process_audio_amplitude()
+        else:
+            self._process_audio_vad()
+            
+    def _process_audio_vad(self):
+        """
+        Stream transcription of speech detected by VAD.
+        
+        While speech continues, the window is re-decoded every hop and words
+        two consecutive hypotheses agree on are emitted straight away. The
+        rest is emitted once the speech segment ends.
+        """
+        max_segment = SAMPLE_RATE * MAX_SEGMENT_SECONDS
+        context = SAMPLE_RATE * CONTEXT_SECONDS
+        hop = SAMPLE_RATE * HOP_SECONDS
+        write_idx = 0
+        vad_idx = 0
+        since_hop = 0
+        in_speech = False
+        silent_chunks = 0
+        agreement = LocalAgreement()
+        prompt = self._prompt  # committed text preceding the buffered audio
+        self.vad_model.reset_states()
         
         while self.is_capturing:
             try:
-                if not self.audio_queue.empty():
-                    chunk = self.audio_queue.get(timeout=1.0)
-                    buffer.append(chunk)
+                if not self._wait_for_chunk():
+                    continue
                     
-                    # Process when buffer reaches sufficient size (about 2.5 seconds)
-                    if len(buffer) > 10:
-                        audio_data = b''.join(buffer)
-                        
-                        # Convert to format needed by Whisper
-                        audio_np = np.frombuffer(audio_data, np.int16).astype(np.float32) / 32768.0
-                        
-                        # Check if there's actual speech (not just silence)
-                        if np.abs(audio_np).mean() > silence_threshold:
-                            # Get transcription from Whisper
-                            result = self.model.transcribe(audio_np)
-                            text = result["text"].strip()
-                            
-                            if text:
-                                self.transcription.append(text)
-                                
-                                # Call the callback if set
-                                if self.new_transcription_callback:
-                                    self.new_transcription_callback(text)
+                write_idx, _ = self._read_chunk(write_idx)
+                
+                # Score every complete VAD frame received since the last chunk
+                chunk_has_speech = False
+                with torch.no_grad():
+                    while vad_idx + VAD_FRAME <= write_idx:
+                        frame = torch.from_numpy(self._ringf[vad_idx:vad_idx + VAD_FRAME])
+                        if self.vad_model(frame, SAMPLE_RATE).item() > VAD_THRESHOLD:
+                            chunk_has_speech = True
+                        vad_idx += VAD_FRAME
+                
+                if chunk_has_speech:
+                    in_speech = True
+                    silent_chunks = 0
+                elif in_speech:
+                    silent_chunks += 1
+                
+                if in_speech and (silent_chunks >= 2 or write_idx >= max_segment):
+                    # Speech segment ended (or ran too long), emit whatever isn't committed yet
+                    words = self._transcribe_words(self._ringf[:write_idx], prompt)
+                    start = int(agreement.committed_end * SAMPLE_RATE)
+                    self._emit_words(agreement.flush(words), self._ringf[start:write_idx])
+                    if silent_chunks >= 2:
+                        in_speech = False
+                        silent_chunks = 0
+                    write_idx = vad_idx = since_hop = 0
+                    prompt = self._prompt
+                elif in_speech:
+                    since_hop += CHUNK_FRAMES
+                    if since_hop >= hop:
+                        since_hop = 0
+                        words = self._transcribe_words(self._ringf[:write_idx], prompt)
+                        self._emit_words(agreement.update(words))
                         
-                        # Reset buffer but keep a small overlap for context
-                        buffer = buffer[-2:]
+                        # Drop audio that is already committed so partial decodes stay short
+                        if write_idx >= context and agreement.committed:
+                            keep = write_idx - min(int(agreement.committed_end * SAMPLE_RATE), write_idx)
+                            removed = write_idx - keep
+                            write_idx = self._keep_tail(write_idx, keep)
+                            vad_idx = max(vad_idx - removed, 0)
+                            agreement.reset()
+                            prompt = self._prompt
                 else:
-                    time.sleep(0.1)
+                    # Keep only the latest chunk so speech onsets aren't clipped
+                    tail = write_idx - vad_idx
+                    write_idx = self._keep_tail(write_idx, CHUNK_FRAMES)
+                    vad_idx = max(write_idx - tail, 0)
             except Exception as e:
                 print(f"Error processing audio: {e}")
                 time.sleep(0.1)
                 
+    def _process_audio_amplitude(self):
+        """Transcribe fixed windows whose mean amplitude suggests speech."""
+        silence_threshold = 0.01  # Adjust based on your environment
+        window = CHUNK_FRAMES * 11  # about 2.75 seconds
+        overlap = CHUNK_FRAMES * 2
+        write_idx = 0
+        levels = []  # Mean amplitude of each buffered chunk
+        
+        while self.is_capturing:
+            try:
+                if not self._wait_for_chunk():
+                    continue
+                    
+                write_idx, level = self._read_chunk(write_idx)
+                levels.append(level)
+                
+                # Process when buffer reaches sufficient size
+                if write_idx >= window:
+                    # Check if there's actual speech (not just silence);
+                    # chunks are equal-sized, so this is the window mean
+                    if sum(levels) / len(levels) > silence_threshold:
+                        self._transcribe_window(self._ringf[:write_idx])
+                    
+                    # Reset buffer but keep a small overlap for context
+                    write_idx = self._keep_tail(write_idx, overlap)
+                    levels = levels[-(overlap // CHUNK_FRAMES):]
+            except Exception as e:
+                print(f"Error processing audio: {e}")
+                time.sleep(0.1)
+                
+    def _wait_for_chunk(self):
+        """
+        Sleep until the PCM ring should hold a full chunk.
+        
+        Sleeps for exactly the time the missing samples take to arrive, so the
+        processing thread wakes once per chunk instead of polling.
+        
+        Returns:
+            bool: True if a full chunk is available
+        """
+        missing = CHUNK_FRAMES - self._pcm.available()
+        if missing > 0:
+            time.sleep(missing / SAMPLE_RATE)
+        return self._pcm.available() >= CHUNK_FRAMES
+        
+    def _read_chunk(self, write_idx):
+        """
+        Convert one chunk straight out of the PCM ring into the float32 audio window.
+        
+        Args:
+            write_idx (int): Current end of the buffered audio
+            
+        Returns:
+            tuple: New end of the buffered audio and the chunk's mean absolute amplitude
+        """
+        # Drop the oldest audio rather than overflow the window
+        if write_idx + CHUNK_FRAMES > self._ringf.size:
+            write_idx = 0
+            
+        # Only the new samples are converted; the int16 data is never copied
+        first, second = self._pcm.peek(CHUNK_FRAMES)
+        split = write_idx + first.size
+        level = int16_to_float_and_stats(first, self._ringf[write_idx:split]) * first.size
+        if second.size:
+            level += int16_to_float_and_stats(second, self._ringf[split:split + second.size]) * second.size
+        self._pcm.advance(CHUNK_FRAMES)
+        return write_idx + CHUNK_FRAMES, level / CHUNK_FRAMES
+        
+    def _keep_tail(self, write_idx, size):
+        """Move the last `size` buffered samples to the front of the window."""
+        size = min(size, write_idx)
+        self._ringf[:size] = self._ringf[write_idx - size:write_idx]
+        return size
+        
+    def _run_inference(self, audio_np):
+        """Transcribe a float32 audio window; runs on the inference worker."""
+        # Segments are decoded lazily, so consume them here rather than on the caller's thread
+        segments, _ = self.model.transcribe(audio_np, vad_filter=False, beam_size=1)
+        return " ".join(segment.text.strip() for segment in segments).strip()
+        
+    def _run_word_inference(self, audio_np, initial_prompt):
+        """Transcribe a float32 audio window into (word, start_time, end_time, probability) tuples; runs on the inference worker."""
+        segments, _ = self.model.transcribe(
+            audio_np,
+            vad_filter=False,
+            beam_size=1,
+            word_timestamps=True,
+            initial_prompt=initial_prompt or None,
+            condition_on_previous_text=False
+        )
+        return [(word.word, word.start, word.end, word.probability) for segment in segments for word in segment.words]
+        
+    def _transcribe_words(self, audio_np, prompt):
+        """Decode a window into (word, start_time, end_time, probability) tuples, steering Whisper with the text committed before it."""
+        return self._infer_pool.submit(self._run_word_inference, audio_np, prompt).result()
+        
+    def _emit_words(self, words, audio_np=None):
+        """
+        Emit committed words as a new transcription segment.
+        
+        Args:
+            words (list): (word, start_time, end_time, probability) tuples
+            audio_np (np.ndarray, optional): Audio the words were decoded from; kept
+                for refine_transcript() if the words are low-confidence
+        """
+        text = "".join(word[0] for word in words).strip()
+        
+        if text:
+            self.transcription.append(text)
+            self._prompt = f"{self._prompt} {text}"[-PROMPT_CHARS:]
+            
+            confidence = sum(word[3] for word in words) / len(words)
+            if (audio_np is not None and confidence < UNCERTAIN_PROBABILITY
+                    and len(self._uncertain) < MAX_UNCERTAIN_WINDOWS):
+                self._uncertain.append((len(self.transcription) - 1, audio_np.copy()))
+            
+            # Call the callback if set
+            if self.new_transcription_callback:
+                self.new_transcription_callback(text)
+                
+    def _transcribe_window(self, audio_np):
+        """Run Whisper on a float32 audio window and emit any text."""
+        text = self._infer_pool.submit(self._run_inference, audio_np).result()
+        
+        if text:
+            self.transcription.append(text)
+            
+            # Call the callback if set
+            if self.new_transcription_callback:
+                self.new_transcription_callback(text)
+                
+    def bulk_transcribe(self, windows, batch_size=16):
+        """
+        Transcribe several audio windows in batched Whisper forward passes.
+        
+        Args:
+            windows (list): 16 kHz mono float32 arrays, each at most 30 seconds long
+            batch_size (int): Number of windows decoded per forward pass
+            
+        Returns:
+            list: Transcribed text for each window
+        """
+        if not windows:
+            return []
+            
+        # The pipeline joins consecutive clips into chunks of up to 30 seconds, so pad every
+        # window to a full 30 second clip to have it decoded as a chunk of its own;
+        # clip_timestamps are in seconds, which the batched pipeline accepts from faster-whisper 1.2.0
+        clip = SAMPLE_RATE * BATCH_CLIP_SECONDS
+        audio = np.zeros(clip * len(windows), dtype=np.float32)
+        for i, window in enumerate(windows):
+            window = window[:clip]
+            audio[i * clip:i * clip + window.size] = window
+        clips = [{"start": float(i * BATCH_CLIP_SECONDS), "end": float((i + 1) * BATCH_CLIP_SECONDS)}
+                 for i in range(len(windows))]
+        
+        def run():
+            segments, _ = self._batched.transcribe(
+                audio,
+                batch_size=batch_size,
+                vad_filter=False,
+                clip_timestamps=clips
+            )
+            texts = [[] for _ in windows]
+            for segment in segments:
+                # Chunk offsets are whole multiples of the clip length
+                index = int(segment.start // BATCH_CLIP_SECONDS)
+                texts[min(max(index, 0), len(windows) - 1)].append(segment.text.strip())
+            return [" ".join(parts).strip() for parts in texts]
+            
+        return self._infer_pool.submit(run).result()
+        
+    def refine_transcript(self):
+        """
+        Re-decode low-confidence transcription segments in one batched pass.
+        
+        Intended to run after capture stops, e.g. before exporting the meeting.
+        
+        Returns:
+            list: (transcription index, new text) pairs for the replaced segments
+        """
+        uncertain, self._uncertain = self._uncertain, []
+        if not uncertain:
+            return []
+            
+        replaced = []
+        texts = self.bulk_transcribe([audio_np for _, audio_np in uncertain])
+        for (index, _), text in zip(uncertain, texts):
+            if text and text != self.transcription[index]:
+                self.transcription[index] = text
+                replaced.append((index, text))
+        return replaced
+        
     def get_full_transcript(self):
         """Get the complete transcript as a string."""
         return " ".join(self.transcription)
@@ -0,0 +1,85 @@
+"""
+Single-producer/single-consumer ring buffer for PCM audio.
+Moves samples from the audio capture callback to the processing thread without locks.
+"""
+
+import numpy as np
+
+class PCMRing:
+    def __init__(self, capacity, dtype=np.int16):
+        """
+        Initialize the ring buffer.
+
+        Only one thread may call write() and only one thread may call
+        peek() and advance(). The consumer reads samples in place through the
+        views peek() returns, then releases them with advance(). Each index is
+        written by a single side and read by the other, and CPython stores an
+        int attribute atomically, so no lock is needed as long as samples are
+        copied in before, and read out before, the index is published.
+
+        Args:
+            capacity (int): Number of samples the ring can hold
+            dtype: Sample type. Defaults to np.int16.
+        """
+        self._buf = np.empty(capacity, dtype=dtype)
+        self.capacity = capacity
+        self._w = 0  # Total samples written, owned by the producer
+        self._r = 0  # Total samples read, owned by the consumer
+        self.overruns = 0
+
+    def clear(self):
+        """Discard all buffered samples. Only call when neither side is running."""
+        self._w = 0
+        self._r = 0
+        self.overruns = 0
+
+    def available(self):
+        """Get the number of samples waiting to be read."""
+        return self._w - self._r
+
+    def write(self, samples):
+        """
+        Append samples to the ring (producer side).
+
+        Args:
+            samples (np.ndarray): Samples to append
+
+        Returns:
+            bool: False if the chunk was dropped because the consumer fell behind
+        """
+        n = samples.size
+        w = self._w
+        if n > self.capacity - (w - self._r):
+            self.overruns += 1
+            return False
+
+        start = w % self.capacity
+        first = min(n, self.capacity - start)
+        self._buf[start:start + first] = samples[:first]
+        if first < n:
+            self._buf[:n - first] = samples[first:]
+
+        # Publish only after the samples are in place
+        self._w = w + n
+        return True
+
+    def peek(self, n):
+        """
+        Get views of the oldest `n` buffered samples without copying them (consumer side).
+
+        The samples stay reserved until advance() is called, so the producer
+        cannot overwrite them while they are being read.
+
+        Args:
+            n (int): Number of samples to view; must not exceed available()
+
+        Returns:
+            tuple: Two array views; the second is empty unless the samples wrap around
+        """
+        start = self._r % self.capacity
+        first = min(n, self.capacity - start)
+        return self._buf[start:start + first], self._buf[:n - first]
+
+    def advance(self, n):
+        """Release `n` samples previously returned by peek() (consumer side)."""
+        self._r += n
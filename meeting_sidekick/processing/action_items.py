@@ -0,0 +1,40 @@
+"""
+Action item model for Meeting Sidekick.
+Action items are read on every render and export, so they are stored as
+slotted dataclasses rather than dictionaries.
+"""
+
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+@dataclass
+class ActionItem:
+    # Declared by hand rather than with dataclass(slots=True) to keep Python 3.9 support
+    __slots__ = ("person", "task", "deadline", "priority")
+
+    person: str
+    task: str
+    deadline: Optional[str]
+    priority: Optional[str]
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Create an action item from a dictionary, e.g. parsed model output.
+
+        Args:
+            data (dict): Action item with person, task, deadline and priority keys
+
+        Returns:
+            ActionItem: The action item
+        """
+        return cls(
+            person=data.get("person") or "",
+            task=data.get("task") or "",
+            deadline=data.get("deadline"),
+            priority=data.get("priority")
+        )
+
+    def to_dict(self):
+        """Convert the action item to a dictionary for serialization."""
+        return asdict(self)
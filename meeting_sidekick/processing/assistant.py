@@ -1,8 +1,137 @@
 import openai
+import asyncio
 import json
+import threading
 import time
+from collections import deque
 from datetime import datetime
 from ..utils.export import export_to_file
+from . import embeddings
+from .action_items import ActionItem
+from .insights import prioritize_insights
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Model used for all OpenAI requests
+CHAT_MODEL = "gpt-4o-mini"
+
+# Structured output schemas; strict mode requires every field to be listed as required
+INSIGHTS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "insights": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "title": {"type": "string"},
+                    "detail": {"type": "string"}
+                },
+                "required": ["title", "detail"],
+                "additionalProperties": False
+            }
+        }
+    },
+    "required": ["insights"],
+    "additionalProperties": False
+}
+
+_ACTION_ITEM_LIST_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "person": {"type": "string"},
+            "task": {"type": "string"},
+            "deadline": {"type": ["string", "null"]},
+            "priority": {"type": ["string", "null"]}
+        },
+        "required": ["person", "task", "deadline", "priority"],
+        "additionalProperties": False
+    }
+}
+
+ACTION_ITEMS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "action_items": _ACTION_ITEM_LIST_SCHEMA
+    },
+    "required": ["action_items"],
+    "additionalProperties": False
+}
+
+SUMMARY_AND_ACTIONS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "string"},
+        "action_items": _ACTION_ITEM_LIST_SCHEMA
+    },
+    "required": ["summary", "action_items"],
+    "additionalProperties": False
+}
+
+# Placeholder shown when action items couldn't be extracted
+_ERROR_ACTION_ITEM = ActionItem(person="", task="Error extracting action items, please try again later",
+                                deadline=None, priority=None)
+
+def _json_schema_format(name, schema):
+    """Build a strict json_schema response_format for a chat completion."""
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": name, "schema": schema, "strict": True}
+    }
+
+def _loads(text):
+    """Parse JSON text, using orjson when it is installed."""
+    return orjson.loads(text) if orjson is not None else json.loads(text)
+
+def _extract_json(text):
+    """
+    Parse the first complete JSON object or array embedded in text, in a single pass.
+    
+    Args:
+        text (str): Model response that may wrap JSON in other text
+        
+    Returns:
+        The parsed JSON value
+    """
+    depth = 0
+    start = -1
+    in_string = False
+    escape = False
+    
+    for i, c in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif c == '\\':
+                escape = True
+            elif c == '"':
+                in_string = False
+        elif c in '[{':
+            if start < 0:
+                start = i
+            depth += 1
+        elif start < 0:
+            continue
+        elif c == '"':
+            in_string = True
+        elif c in ']}':
+            depth -= 1
+            if depth == 0:
+                return _loads(text[start:i + 1])
+                
+    raise ValueError("No JSON found in response")
+
+def _parse_json(content):
+    """Parse a model response as JSON, falling back to the JSON value embedded in it."""
+    try:
+        return _loads(content)
+    except ValueError:
+        return _extract_json(content)
 
 class MeetingAssistant:
     def __init__(self, api_key):
@@ -12,16 +141,41 @@ class MeetingAssistant:
         Args:
             api_key (str): OpenAI API key
         """
-        self.client = openai.OpenAI(api_key=api_key)
+        self.client = openai.AsyncOpenAI(api_key=api_key)
         self.meeting_transcript = []
+        self._joined_cache = {}  # separator -> (segment count, joined transcript)
         self.current_summary = ""
+        self._summarized_up_to = 0  # transcript segments already folded into current_summary
         self.action_items = []
-        self.conversation_context = []
+        self.conversation_context = deque(maxlen=20)  # oldest segments drop off automatically
         self.last_insight_time = 0
         self.insight_cooldown = 30  # seconds between insights
+        self.insight_similarity_threshold = 0.85  # skip insights if the conversation hasn't moved on
+        self._last_trigger_emb = None
         self.meeting_title = f"Meeting {datetime.now().strftime('%Y-%m-%d %H:%M')}"
         self.insight_callback = None
         
+        # Event loop that runs all OpenAI requests in the background
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._loop_thread.start()
+        self._insight_future = None
+        
+        # Load the embedding model now rather than on the first transcript
+        embeddings.warm_up()
+        
+    def run_sync(self, coro):
+        """
+        Run a coroutine on the assistant's event loop and wait for its result.
+        
+        Args:
+            coro: Coroutine, e.g. assistant.update_summary()
+            
+        Returns:
+            The coroutine's result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+        
     def set_insight_callback(self, callback):
         """Set callback for when new insights are generated."""
         self.insight_callback = callback
@@ -42,22 +196,95 @@ class MeetingAssistant:
             
         self.meeting_transcript.append(text_segment)
         self.conversation_context.append(text_segment)
+            
+        # Check for potential insights in the background, one request at a time
+        if self._insight_future is None or self._insight_future.done():
+            self._insight_future = asyncio.run_coroutine_threadsafe(
+                self._generate_real_time_insights(), self._loop
+            )
+            
+    def revise_transcript(self, replacements):
+        """
+        Replace transcript lines with revised text, e.g. from SpeechRecognizer.refine_transcript().
+        
+        Lines are numbered in the order they were added, one per recognizer
+        segment, so line n is the recognizer's transcription[n] even when
+        several lines were batched into one transcript segment.
+        
+        Args:
+            replacements (list): (line index, new text) pairs
+        """
+        revised = dict(replacements)
+        line = 0
+        for i, segment in enumerate(self.meeting_transcript):
+            if not revised:
+                break
+            lines = segment.split("\n")
+            changed = False
+            for j in range(len(lines)):
+                text = revised.pop(line + j, None)
+                if text is not None:
+                    lines[j] = text
+                    changed = True
+            line += len(lines)
+            if changed:
+                self.meeting_transcript[i] = "\n".join(lines)
+                
+        # Joined copies were built from the old text
+        self._joined_cache.clear()
+        
+    async def _stream_completion(self, messages, response_format=None):
+        """
+        Stream a chat completion and accumulate its text.
         
-        # Keep conversation context to a manageable size
-        if len(self.conversation_context) > 20:
-            self.conversation_context = self.conversation_context[-20:]
+        Args:
+            messages (list): Chat messages
+            response_format (dict, optional): Structured output format for the response
             
-        # Check for potential insights
-        self._generate_real_time_insights()
+        Returns:
+            str: The accumulated response text
+        """
+        parts = []
+        request = {"model": CHAT_MODEL, "messages": messages, "stream": True}
+        if response_format is not None:
+            request["response_format"] = response_format
+        stream = await self.client.chat.completions.create(**request)
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+        finally:
+            await stream.close()
+        return "".join(parts)
+        
+    def _unsummarized_segments(self):
+        """
+        Get the transcript segments that aren't reflected in the summary yet.
+        
+        Returns:
+            tuple: (transcript length, new segments); no segments if there are
+            too few to be worth updating an existing summary for
+        """
+        end = len(self.meeting_transcript)
+        new_segments = self.meeting_transcript[self._summarized_up_to:end]
+        if self.current_summary and len(new_segments) < 3:
+            new_segments = []
+        return end, new_segments
         
-    def update_summary(self):
-        """Update the meeting summary with recent transcript segments."""
+    async def update_summary(self):
+        """Update the meeting summary with transcript segments added since the last update."""
         # If there are no transcript segments, return empty string
         if not self.meeting_transcript:
             return ""
             
-        # Create a prompt for summarization using recent segments
-        recent_transcript = " ".join(self.meeting_transcript[-10:])
+        end, new_segments = self._unsummarized_segments()
+        if not new_segments:
+            return self.current_summary
+            
+        recent_transcript = " ".join(new_segments)
         
         prompt = f"""
         Previous summary: {self.current_summary}
@@ -71,28 +298,24 @@ class MeetingAssistant:
         """
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that summarizes meetings."},
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            
-            self.current_summary = response.choices[0].message.content
+            self.current_summary = await self._stream_completion([
+                {"role": "system", "content": "You are a helpful assistant that summarizes meetings."},
+                {"role": "user", "content": prompt}
+            ])
+            self._summarized_up_to = end
             return self.current_summary
         except Exception as e:
             print(f"Error updating summary: {e}")
             return self.current_summary or "Unable to generate summary at this time."
     
-    def extract_action_items(self):
+    async def extract_action_items(self):
         """Extract action items from the meeting transcript."""
         # If there are no transcript segments, return empty list
         if not self.meeting_transcript:
             return []
             
         # Create a prompt for action item extraction
-        full_transcript = " ".join(self.meeting_transcript)
+        full_transcript = self._joined_transcript(" ")
         
         prompt = f"""
         Based on the following meeting transcript, identify all action items.
@@ -102,54 +325,101 @@ class MeetingAssistant:
         3. The deadline (if mentioned)
         4. Priority level (if indicated)
         
-        Format the output as a JSON array of objects with the following structure:
-        [
-            {{"person": "Name", "task": "Task description", "deadline": "Deadline or null", "priority": "Priority or null"}}
-        ]
+        Use null for a deadline or priority that isn't mentioned.
         
         Meeting transcript:
         {full_transcript}
         """
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that extracts action items from meeting transcripts."},
-                    {"role": "user", "content": prompt}
-                ]
-            )
+            content = await self._stream_completion([
+                {"role": "system", "content": "You are a helpful assistant that extracts action items from meeting transcripts."},
+                {"role": "user", "content": prompt}
+            ], _json_schema_format("action_items", ACTION_ITEMS_SCHEMA))
             
-            content = response.choices[0].message.content
-            
-            # Try to parse the JSON response
-            try:
-                # Find JSON array in the response if it's not pure JSON
-                if content.strip().startswith('[') and content.strip().endswith(']'):
-                    self.action_items = json.loads(content)
-                else:
-                    # Try to extract JSON from text
-                    start_idx = content.find('[')
-                    end_idx = content.rfind(']') + 1
-                    if start_idx >= 0 and end_idx > start_idx:
-                        json_str = content[start_idx:end_idx]
-                        self.action_items = json.loads(json_str)
-                    else:
-                        raise ValueError("No JSON array found in response")
-            except json.JSONDecodeError:
-                # Fallback if response isn't valid JSON
-                self.action_items = [{"task": "Error parsing action items, please check transcript manually"}]
-                
+            self.action_items = [ActionItem.from_dict(item) for item in _parse_json(content)["action_items"]]
             return self.action_items
         except Exception as e:
             print(f"Error extracting action items: {e}")
-            return [{"task": "Error extracting action items, please try again later"}]
+            return [_ERROR_ACTION_ITEM]
+        
+    async def update_summary_and_actions(self):
+        """
+        Update the summary and action items together with a single request.
+        
+        Only transcript segments added since the last summary update are sent,
+        along with the current summary and action items for the model to revise.
+        
+        Returns:
+            tuple: (summary, action_items)
+        """
+        # If there are no transcript segments, there is nothing to summarize
+        if not self.meeting_transcript:
+            return "", []
+            
+        end, new_segments = self._unsummarized_segments()
+        if not new_segments:
+            return self.current_summary, self.action_items
+            
+        recent_transcript = " ".join(new_segments)
+        
+        prompt = f"""
+        Previous summary: {self.current_summary}
+        
+        Previous action items: {json.dumps([item.to_dict() for item in self.action_items])}
+        
+        New meeting transcript segment: 
+        {recent_transcript}
+        
+        Please update the summary to incorporate this new information. 
+        Focus on key points, decisions, and important discussion topics.
+        Keep the summary concise but comprehensive.
+        
+        Also return the complete, updated list of action items: keep the previous
+        ones unless the new segment changes them, and add any new ones with the
+        responsible person, the specific task, the deadline and the priority level.
+        Use null for a deadline or priority that isn't mentioned.
+        """
+        
+        try:
+            content = await self._stream_completion([
+                {"role": "system", "content": "You are a helpful assistant that summarizes meetings and tracks their action items."},
+                {"role": "user", "content": prompt}
+            ], _json_schema_format("summary_and_actions", SUMMARY_AND_ACTIONS_SCHEMA))
+            
+            result = _parse_json(content)
+            self.current_summary = result["summary"]
+            self.action_items = [ActionItem.from_dict(item) for item in result["action_items"]]
+            self._summarized_up_to = end
+            return self.current_summary, self.action_items
+        except Exception as e:
+            print(f"Error updating summary and action items: {e}")
+            return (self.current_summary or "Unable to generate summary at this time.",
+                    self.action_items or [_ERROR_ACTION_ITEM])
         
     def get_full_transcript(self):
         """Get the complete meeting transcript."""
-        return "\n".join(self.meeting_transcript)
+        return self._joined_transcript("\n")
         
-    def _generate_real_time_insights(self):
+    def _joined_transcript(self, sep):
+        """
+        Get the transcript joined with `sep`, extending a cached copy with new segments only.
+        
+        Args:
+            sep (str): Separator placed between segments
+            
+        Returns:
+            str: The joined transcript
+        """
+        count = len(self.meeting_transcript)
+        cached_count, text = self._joined_cache.get(sep, (0, ""))
+        if cached_count != count:
+            new_text = sep.join(self.meeting_transcript[cached_count:count])
+            text = text + sep + new_text if cached_count else new_text
+            self._joined_cache[sep] = (count, text)
+        return text
+        
+    async def _generate_real_time_insights(self):
         """Generate real-time insights from the conversation context."""
         current_time = time.time()
         
@@ -163,6 +433,13 @@ class MeetingAssistant:
         # Create a prompt for generating real-time insights
         recent_context = " ".join(self.conversation_context)
         
+        # Skip the API call if the conversation is still on the same topic as last time;
+        # embedding runs in a worker thread so it doesn't hold up other requests on the loop
+        context_emb = await asyncio.to_thread(embeddings.encode, recent_context)
+        if (context_emb is not None and self._last_trigger_emb is not None
+                and float(context_emb @ self._last_trigger_emb) > self.insight_similarity_threshold):
+            return
+        
         prompt = f"""
         Based on the following recent meeting conversation, generate 1-2 highly relevant insights that would help the user contribute meaningfully.
         
@@ -176,46 +453,27 @@ class MeetingAssistant:
         Recent conversation:
         {recent_context}
         
-        Format as a JSON object with "insights" array containing objects with "title" and "detail" fields.
+        Return each insight with a short "title" and a "detail".
         """
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an AI assistant that provides real-time conversational insights."},
-                    {"role": "user", "content": prompt}
-                ]
-            )
+            content = await self._stream_completion([
+                {"role": "system", "content": "You are an AI assistant that provides real-time conversational insights."},
+                {"role": "user", "content": prompt}
+            ], _json_schema_format("insights", INSIGHTS_SCHEMA))
+            self._last_trigger_emb = context_emb
             
-            content = response.choices[0].message.content
-            
-            # Try to parse the JSON response
-            try:
-                # Find JSON object in the response if it's not pure JSON
-                if content.strip().startswith('{') and content.strip().endswith('}'):
-                    insights_data = json.loads(content)
-                else:
-                    # Try to extract JSON from text
-                    start_idx = content.find('{')
-                    end_idx = content.rfind('}') + 1
-                    if start_idx >= 0 and end_idx > start_idx:
-                        json_str = content[start_idx:end_idx]
-                        insights_data = json.loads(json_str)
-                    else:
-                        raise ValueError("No JSON object found in response")
+            insights_data = _parse_json(content)
+            insights = await asyncio.to_thread(
+                prioritize_insights, insights_data["insights"], list(self.conversation_context)
+            )
+            if insights:
+                # Update last insight time
+                self.last_insight_time = current_time
                 
-                if insights_data and "insights" in insights_data and len(insights_data["insights"]) > 0:
-                    # Update last insight time
-                    self.last_insight_time = current_time
-                    
-                    # Call the insight callback if set
-                    if self.insight_callback:
-                        self.insight_callback(insights_data["insights"])
-            except (json.JSONDecodeError, ValueError) as e:
-                print(f"Error parsing insights: {e}")
-                # Silently fail - insights are optional and shouldn't disrupt the meeting
-                pass
+                # Call the insight callback if set
+                if self.insight_callback:
+                    self.insight_callback(insights)
         except Exception as e:
             print(f"Error generating insights: {e}")
             
@@ -0,0 +1,62 @@
+"""
+Sentence embedding helpers for Meeting Sidekick.
+Loads a small local embedding model on first use so conversation text can be
+compared cheaply before spending an OpenAI API call on it.
+"""
+
+import threading
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+_model = None
+_model_failed = False
+_model_lock = threading.Lock()
+
+def get_embedder():
+    """
+    Get the shared sentence embedding model, loading it on first use.
+
+    Returns:
+        SentenceTransformer or None: The model, or None if it is unavailable
+    """
+    global _model, _model_failed
+
+    if _model is not None or _model_failed:
+        return _model
+
+    with _model_lock:
+        if _model is None and not _model_failed:
+            # sentence-transformers pulls in torch, so only import it when the model is needed
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError:
+                _model_failed = True
+                return None
+                
+            try:
+                _model = SentenceTransformer(MODEL_NAME)
+            except Exception as e:
+                print(f"Error loading embedding model: {e}")
+                _model_failed = True
+    return _model
+
+def encode(texts):
+    """
+    Embed one or more texts as unit-length vectors.
+
+    Args:
+        texts (str or list): Text or list of texts to embed
+
+    Returns:
+        np.ndarray or None: Normalized embeddings, or None if no model is available
+    """
+    model = get_embedder()
+    if model is None:
+        return None
+    return model.encode(texts, normalize_embeddings=True)
+
+def warm_up():
+    """Load the embedding model and run one encode so later calls hit warm caches."""
+    model = get_embedder()
+    if model is not None:
+        model.encode("warm up", normalize_embeddings=True)
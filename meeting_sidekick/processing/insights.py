@@ -3,6 +3,23 @@ Insights generation and processing module for Meeting Sidekick.
 This module provides functions for formatting and presenting insights to users.
 """
 
+import re
+
+import numpy as np
+
+from . import embeddings
+
+# Keywords used to categorize insights; suggestion keywords take precedence over fact keywords
+_CATEGORY_KEYWORDS = {
+    "suggest": "suggestions",
+    "should": "suggestions",
+    "could": "suggestions",
+    "fact": "facts",
+    "data": "facts",
+    "according to": "facts",
+}
+_CATEGORY_PATTERN = re.compile("|".join(re.escape(keyword) for keyword in _CATEGORY_KEYWORDS))
+
 def format_insight_for_display(insight):
     """
     Format a single insight for display in the CLI.
@@ -42,29 +59,49 @@ def categorize_insights(insights):
     }
     
     for insight in insights:
-        detail = insight.get('detail', '').lower()
-        
-        if "suggest" in detail or "should" in detail or "could" in detail:
-            categories["suggestions"].append(insight)
-        elif "fact" in detail or "data" in detail or "according to" in detail:
-            categories["facts"].append(insight)
-        else:
-            categories["other"].append(insight)
+        # Match every keyword in a single scan of the detail text
+        category = "other"
+        for match in _CATEGORY_PATTERN.finditer(insight.get('detail', '').lower()):
+            category = _CATEGORY_KEYWORDS[match.group()]
+            if category == "suggestions":
+                break
+                
+        categories[category].append(insight)
             
     return categories
 
-def prioritize_insights(insights, conversation_context=None):
+def prioritize_insights(insights, conversation_context=None, top_k=3, min_score=0.3):
     """
     Prioritize insights based on their relevance to the current conversation.
     
+    Insights are ranked by cosine similarity between their embedding and the
+    embedding of the last few conversation segments; insights scoring below
+    `min_score` are dropped. Each insight's embedding is cached under its
+    '_emb' key. If no embedding model is available, insights are returned as-is.
+    
     Args:
         insights (list): List of insight dictionaries
-        conversation_context (list, optional): List of recent conversation texts
+        conversation_context (iterable, optional): Recent conversation texts
+        top_k (int): Maximum number of insights to return
+        min_score (float): Minimum similarity for an insight to be kept
         
     Returns:
         list: Prioritized list of insights
     """
-    # This is a simple placeholder implementation
-    # In a more advanced version, this could use semantic similarity
-    # to prioritize insights based on their relevance to the conversation
-    return insights  # For now, just return the insights as-is
+    if not insights or not conversation_context:
+        return insights
+        
+    context_emb = embeddings.encode(" ".join(list(conversation_context)[-5:]))
+    if context_emb is None:
+        return insights
+        
+    # Embed only the insights that don't have a cached embedding yet
+    missing = [insight for insight in insights if '_emb' not in insight]
+    if missing:
+        texts = [f"{i.get('title', '')}. {i.get('detail', '')}" for i in missing]
+        for insight, emb in zip(missing, embeddings.encode(texts)):
+            insight['_emb'] = emb
+            
+    scores = np.stack([insight['_emb'] for insight in insights]) @ context_emb
+    ranked = sorted(zip(scores, range(len(insights))), reverse=True)
+    return [insights[i] for score, i in ranked if score > min_score][:top_k]
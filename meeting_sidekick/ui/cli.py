@@ -1,22 +1,68 @@
 """
 Command-line interface for the Meeting Sidekick application.
-Uses the Rich library for enhanced terminal visuals.
+Uses the Rich library for enhanced terminal visuals; Rich is imported where
+it is used so importing this module stays cheap.
 """
 
+import os
+import sys
 import time
 import threading
-from rich.console import Console
-from rich.layout import Layout
-from rich.panel import Panel
-from rich.table import Table
-from rich.live import Live
-from rich.text import Text
-from rich.markdown import Markdown
-from rich.prompt import Prompt, Confirm
-import click
+from collections import deque
 
 from ..processing.insights import format_insight_for_display
 
+try:
+    import termios
+except ImportError:  # Windows
+    termios = None
+    import msvcrt
+
+_tty_fd = None  # controlling terminal, opened when stdin is redirected
+
+def _key_fd():
+    """
+    Get a file descriptor to read keys from, like click.getchar.
+    
+    Returns:
+        int: stdin if it is a terminal, else /dev/tty, or -1 if there is no terminal
+    """
+    global _tty_fd
+    if sys.stdin.isatty():
+        return sys.stdin.fileno()
+    if _tty_fd is None:
+        try:
+            _tty_fd = os.open("/dev/tty", os.O_RDONLY)
+        except OSError:
+            _tty_fd = -1
+    return _tty_fd
+
+def _read_key_blocking():
+    """
+    Block until a single key is pressed and return it without echoing.
+    
+    Returns:
+        str: The key that was pressed, or "" if there is no terminal and stdin is exhausted
+    """
+    if termios is None:
+        return msvcrt.getwch()
+        
+    fd = _key_fd()
+    if fd < 0:
+        return sys.stdin.read(1)
+        
+    old_attrs = termios.tcgetattr(fd)
+    new_attrs = termios.tcgetattr(fd)
+    # Non-canonical mode: read() returns as soon as one byte arrives, with no timeout
+    new_attrs[3] &= ~(termios.ICANON | termios.ECHO)
+    new_attrs[6][termios.VMIN] = 1
+    new_attrs[6][termios.VTIME] = 0
+    try:
+        termios.tcsetattr(fd, termios.TCSANOW, new_attrs)
+        return os.read(fd, 1).decode(errors="ignore")
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, old_attrs)
+
 class MeetingSidekickCLI:
     def __init__(self, recorder, assistant):
         """
@@ -26,36 +72,85 @@ class MeetingSidekickCLI:
             recorder: SpeechRecognizer instance
             assistant: MeetingAssistant instance
         """
+        from rich.console import Console
+        from rich.table import Table
+        
         self.recorder = recorder
         self.assistant = assistant
         self.console = Console()
         self.layout = None
         self.live = None
         self.recording = False
-        self.transcript_text = []
+        self.transcript_text = deque(maxlen=20)  # display window; the assistant keeps the full transcript
         self.current_insights = []
+        self._fmt_cache = {}  # id(insight) -> formatted markup for current_insights
         self.summary_text = ""
         self.action_items = []
         
+        # Layout slots that need to be rebuilt on the next render
+        self._dirty = {'header': True, 'transcript': True, 'summary': True, 'insights': True, 'actions': True}
+        
+        # Action item table, refilled in place whenever the action items change
+        self._action_table = Table(box=None)
+        self._action_table.add_column("Person", style="cyan")
+        self._action_table.add_column("Task", style="green")
+        self._action_table.add_column("Deadline", style="yellow")
+        self._action_table.add_column("Priority", style="red")
+        
         # Set up callbacks
         self.recorder.set_transcription_callback(self.on_new_transcription)
         self.assistant.set_insight_callback(self.on_new_insights)
         
         # Thread for updating summary and action items
         self.update_thread = None
-        self.should_update = False
+        self._stop_event = threading.Event()
+        self.update_interval = 25  # seconds between summary and action item updates
+        
+        # Transcriptions waiting to be passed to the assistant in one batch
+        self._pending = deque()
+        self._pending_lock = threading.Lock()
+        self.flush_interval = 0.25  # seconds between transcript batches
         
     def on_new_transcription(self, text):
         """Handle new transcription from the recorder."""
-        self.transcript_text.append(text)
-        self.assistant.add_transcript(text)
+        with self._pending_lock:
+            self._pending.append(text)
+            self.transcript_text.append(text)
+        self._dirty['transcript'] = True
+        
+        # A decode still in flight when recording stops finishes after the update
+        # thread is gone, so pass its text on straight away instead of queuing it
+        if not self.recording:
+            self._flush_pending()
+        
+    def _flush_pending(self):
+        """Hand all transcriptions received since the last flush to the assistant in one call."""
+        with self._pending_lock:
+            if not self._pending:
+                return
+            batch = list(self._pending)
+            self._pending.clear()
+            # Called under the lock so batches reach the assistant in order
+            self.assistant.add_transcript("\n".join(batch))
         
     def on_new_insights(self, insights):
         """Handle new insights from the assistant."""
+        # Formatted text is keyed by id(), so drop it before the old insights can be freed
+        self._fmt_cache = {}
         self.current_insights = insights
+        self._dirty['insights'] = True
+        
+    def _format_cached(self, insight):
+        """Format an insight for display, reusing the text from earlier renders."""
+        text = self._fmt_cache.get(id(insight))
+        if text is None:
+            text = self._fmt_cache[id(insight)] = format_insight_for_display(insight)
+        return text
         
     def generate_layout(self):
         """Generate the Rich layout for the application."""
+        from rich.layout import Layout
+        
         layout = Layout(name="root")
         
         # Split the screen into two main sections
@@ -85,92 +180,118 @@ class MeetingSidekickCLI:
         return layout
         
     def update_layout(self):
-        """Update the layout with current data."""
-        # Header
-        status = "[bold green]Recording[/bold green]" if self.recording else "[bold red]Not Recording[/bold red]"
-        self.layout["header"].update(
-            Panel(f"Meeting Sidekick - {status}", 
-                  style="bold white on blue")
-        )
+        """Update the layout slots whose data changed since the last render."""
+        from rich.markdown import Markdown
+        from rich.panel import Panel
+        from rich.text import Text
+        
+        # Each slot keeps its last panel until the data behind it changes;
+        # flags are cleared before rebuilding so concurrent updates aren't lost
+        if self._dirty['header']:
+            self._dirty['header'] = False
+            status = "[bold green]Recording[/bold green]" if self.recording else "[bold red]Not Recording[/bold red]"
+            self.layout["header"].update(
+                Panel(f"Meeting Sidekick - {status}", 
+                      style="bold white on blue")
+            )
         
         # Transcript
-        transcript_content = "\n".join(self.transcript_text[-20:])  # Show last 20 lines
-        self.layout["transcript"].update(
-            Panel(
-                Text(transcript_content) if transcript_content else Text("No transcript yet...", style="dim"),
-                title="Live Transcript",
-                border_style="green" if self.recording else "red"
+        if self._dirty['transcript']:
+            self._dirty['transcript'] = False
+            transcript_content = "\n".join(self.transcript_text)  # Show last 20 lines
+            self.layout["transcript"].update(
+                Panel(
+                    Text(transcript_content) if transcript_content else Text("No transcript yet...", style="dim"),
+                    title="Live Transcript",
+                    border_style="green" if self.recording else "red"
+                )
             )
-        )
         
         # Summary
-        self.layout["summary"].update(
-            Panel(
-                Markdown(self.summary_text) if self.summary_text else Text("Summary will appear here...", style="dim"),
-                title="Meeting Summary",
-                border_style="cyan"
+        if self._dirty['summary']:
+            self._dirty['summary'] = False
+            self.layout["summary"].update(
+                Panel(
+                    Markdown(self.summary_text) if self.summary_text else Text("Summary will appear here...", style="dim"),
+                    title="Meeting Summary",
+                    border_style="cyan"
+                )
             )
-        )
         
         # Insights
-        insights_content = ""
-        for insight in self.current_insights:
-            insights_content += format_insight_for_display(insight) + "\n\n"
+        if self._dirty['insights']:
+            self._dirty['insights'] = False
+            insights_content = "\n\n".join(self._format_cached(insight) for insight in self.current_insights)
             
-        self.layout["insights"].update(
-            Panel(
-                Text.from_markup(insights_content) if insights_content else Text("Insights will appear here...", style="dim"),
-                title="Insights",
-                border_style="magenta"
+            self.layout["insights"].update(
+                Panel(
+                    Text.from_markup(insights_content) if insights_content else Text("Insights will appear here...", style="dim"),
+                    title="Insights",
+                    border_style="magenta"
+                )
             )
-        )
         
         # Action Items
-        action_table = Table(box=None)
-        action_table.add_column("Person", style="cyan")
-        action_table.add_column("Task", style="green")
-        action_table.add_column("Deadline", style="yellow")
-        action_table.add_column("Priority", style="red")
-        
-        for item in self.action_items:
-            action_table.add_row(
-                item.get("person", "Unknown"),
-                item.get("task", "No task"),
-                item.get("deadline", ""),
-                item.get("priority", "")
-            )
+        if self._dirty['actions']:
+            self._dirty['actions'] = False
+            action_table = self._action_table
+            # Rich has no public way to remove rows, so empty the row and cell lists
+            for column in action_table.columns:
+                column._cells.clear()
+            action_table.rows.clear()
             
-        self.layout["action_items"].update(
-            Panel(
-                action_table if self.action_items else Text("Action items will appear here...", style="dim"),
-                title="Action Items",
-                border_style="yellow"
+            for item in self.action_items:
+                action_table.add_row(
+                    item.person or "Unknown",
+                    item.task or "No task",
+                    item.deadline or "",
+                    item.priority or ""
+                )
+                
+            self.layout["action_items"].update(
+                Panel(
+                    action_table if self.action_items else Text("Action items will appear here...", style="dim"),
+                    title="Action Items",
+                    border_style="yellow"
+                )
             )
-        )
     
+    def render(self):
+        """Render the current state; called by Live on its own refresh schedule."""
+        self.update_layout()
+        return self.layout
+        
     def update_thread_func(self):
-        """Thread function to periodically update summary and action items."""
-        update_counter = 0
+        """Thread function to batch transcriptions and periodically update summary and action items."""
+        next_update = time.monotonic() + self.update_interval
         
-        while self.should_update:
-            update_counter += 1
+        # Wake to flush pending transcriptions until the next update is due;
+        # stop_recording() wakes the thread immediately
+        while not self._stop_event.wait(timeout=min(self.flush_interval, max(0, next_update - time.monotonic()))):
+            self._flush_pending()
+            if time.monotonic() >= next_update:
+                self.update_summary_and_actions()
+                next_update = time.monotonic() + self.update_interval
             
-            # Update summary every 5 cycles (approx. every 25 seconds)
-            if update_counter % 5 == 0:
-                self.summary_text = self.assistant.update_summary()
-                
-            # Update action items every 10 cycles (approx. every 50 seconds)
-            if update_counter % 10 == 0:
-                self.action_items = self.assistant.extract_action_items()
-                
-            time.sleep(5)  # Sleep for 5 seconds between updates
+    def update_summary_and_actions(self):
+        """Fetch the summary and action items from the assistant in one request."""
+        self.summary_text, self.action_items = self.assistant.run_sync(
+            self.assistant.update_summary_and_actions()
+        )
+        self._mark_dirty('summary', 'actions')
+    
+    def _mark_dirty(self, *sections):
+        """Flag layout slots to be rebuilt on the next render."""
+        for section in sections:
+            self._dirty[section] = True
     
     def start_recording(self):
         """Start recording and processing."""
         if not self.recording:
             self.recording = True
             self.recorder.start_capture()
-            self.should_update = True
+            self._mark_dirty('header', 'transcript')
+            self._stop_event.clear()
             self.update_thread = threading.Thread(target=self.update_thread_func)
             self.update_thread.daemon = True
             self.update_thread.start()
@@ -180,32 +301,45 @@ class MeetingSidekickCLI:
         if self.recording:
             self.recording = False
             self.recorder.stop_capture()
-            self.should_update = False
+            self._mark_dirty('header', 'transcript')
+            self._stop_event.set()
             if self.update_thread:
                 self.update_thread.join(timeout=1.0)
                 
-            # Final update of summary and action items
-            self.summary_text = self.assistant.update_summary()
-            self.action_items = self.assistant.extract_action_items()
+            # Final update of summary and action items, including any transcriptions still pending
+            self._flush_pending()
+            self.refine_transcript()
+            self.update_summary_and_actions()
+            
+    def refine_transcript(self):
+        """Re-decode low-confidence speech and carry the corrections into the assistant's transcript."""
+        try:
+            replacements = self.recorder.refine_transcript()
+        except Exception as e:
+            print(f"Error refining transcript: {e}")
+            return
+        if replacements:
+            self.assistant.revise_transcript(replacements)
     
     def run(self):
         """Run the CLI application."""
-        self.layout = self.generate_layout()
+        from rich.live import Live
+        from rich.markdown import Markdown
+        from rich.prompt import Prompt, Confirm
+        from rich.table import Table
         
-        # Initial update
-        self.update_layout()
+        self.layout = self.generate_layout()
+        self._mark_dirty(*self._dirty)
         
-        # Create Live display
-        with Live(self.layout, refresh_per_second=2, screen=True) as self.live:
+        # Create Live display; it redraws from render() on its own thread
+        with Live(get_renderable=self.render, refresh_per_second=2, screen=True) as self.live:
             try:
                 while True:
-                    self.update_layout()
-                    
-                    # Check for keyboard input (in a real implementation, this would be more sophisticated)
-                    command = click.getchar(echo=False)
+                    # Block until a key is pressed; no polling while idle
+                    command = _read_key_blocking()
                     
-                    if command == 'q':
-                        # Quit
+                    if command == 'q' or not command:
+                        # Quit; an empty read means input ended and no more keys will arrive
                         if self.recording:
                             self.stop_recording()
                         break
@@ -217,10 +351,10 @@ class MeetingSidekickCLI:
                             self.start_recording()
                     elif command == 's':
                         # Force update summary
-                        self.summary_text = self.assistant.update_summary()
+                        self.update_summary_and_actions()
                     elif command == 'a':
                         # Force update action items
-                        self.action_items = self.assistant.extract_action_items()
+                        self.update_summary_and_actions()
                     elif command == 'e':
                         # Export meeting data
                         self.live.stop()
@@ -233,7 +367,7 @@ class MeetingSidekickCLI:
                         filepath = self.assistant.export_meeting_data(output_format)
                         self.console.print(f"[bold green]Exported to:[/bold green] {filepath}")
                         self.console.print("Press any key to continue...")
-                        click.getchar(echo=False)
+                        _read_key_blocking()
                         self.live.start()
                     elif command == 't':
                         # Set meeting title
@@ -242,7 +376,7 @@ class MeetingSidekickCLI:
                         self.assistant.set_meeting_title(title)
                         self.console.print(f"[bold green]Title set to:[/bold green] {title}")
                         self.console.print("Press any key to continue...")
-                        click.getchar(echo=False)
+                        _read_key_blocking()
                         self.live.start()
                     elif command == 'h':
                         # Show help
@@ -256,7 +390,7 @@ class MeetingSidekickCLI:
                         self.console.print("  [bold cyan]h[/bold cyan] - Show this help")
                         self.console.print("  [bold cyan]q[/bold cyan] - Quit")
                         self.console.print("\nPress any key to continue...")
-                        click.getchar(echo=False)
+                        _read_key_blocking()
                         self.live.start()
             
             except KeyboardInterrupt:
@@ -282,10 +416,10 @@ class MeetingSidekickCLI:
         
         for item in self.action_items:
             action_table.add_row(
-                item.get("person", "Unknown"),
-                item.get("task", "No task"),
-                item.get("deadline", ""),
-                item.get("priority", "")
+                item.person or "Unknown",
+                item.task or "No task",
+                item.deadline or "",
+                item.priority or ""
             )
         
         self.console.print(action_table)
@@ -3,18 +3,33 @@ Notification module for Meeting Sidekick.
 Handles desktop notifications for insights and other events.
 """
 
+import os
 import platform
-from plyer import notification
+import sys
+import time
+
+# Identical notifications within this many seconds are dropped
+NOTIFY_COOLDOWN = 2.0
+
+# Any of these marks a Linux session that can show notifications (X11, Wayland, or D-Bus)
+_SESSION_VARIABLES = ("DISPLAY", "WAYLAND_DISPLAY", "DBUS_SESSION_BUS_ADDRESS")
+
+def _has_desktop_session():
+    """Check whether a Linux desktop session is available to show notifications."""
+    return any(os.environ.get(name) for name in _SESSION_VARIABLES)
 
 class NotificationManager:
     def __init__(self):
         """Initialize the notification manager."""
-        self.enabled = True
         self.platform = platform.system()
+        # Without a terminal or, on Linux, a graphical session there is nobody to notify
+        self._interactive = bool(sys.stdout.isatty() and (self.platform != "Linux" or _has_desktop_session()))
+        self.enabled = self._interactive
+        self._last_sent = {}  # (title, message) -> monotonic time it was last sent
         
     def enable(self):
-        """Enable notifications."""
-        self.enabled = True
+        """Enable notifications, if the session is interactive."""
+        self.enabled = self._interactive
         
     def disable(self):
         """Disable notifications."""
@@ -32,7 +47,17 @@ class NotificationManager:
         if not self.enabled:
             return
             
+        # Each notification may spawn a subprocess, so drop repeats in quick succession
+        key = (title, message)
+        now = time.monotonic()
+        if now - self._last_sent.get(key, float("-inf")) < NOTIFY_COOLDOWN:
+            return
+        self._last_sent[key] = now
+            
         try:
+            # plyer is imported on first use to keep start-up fast
+            from plyer import notification
+            
             notification.notify(
                 title=title,
                 message=message,
@@ -58,10 +83,10 @@ class NotificationManager:
         Send a notification for a new action item.
         
         Args:
-            action_item (dict): Action item dictionary
+            action_item (ActionItem): The new action item
         """
-        person = action_item.get('person', 'Someone')
-        task = action_item.get('task', 'Do something')
+        person = action_item.person or 'Someone'
+        task = action_item.task or 'Do something'
         
         title = f"New Action Item for {person}"
         message = task
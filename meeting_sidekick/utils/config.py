@@ -6,7 +6,8 @@ Handles loading configuration from environment variables and files.
 import os
 import json
 from pathlib import Path
-from dotenv import load_dotenv
+
+from .export import ensure_export_dir
 
 # Default configuration
 DEFAULT_CONFIG = {
@@ -19,14 +20,35 @@ DEFAULT_CONFIG = {
     "export_directory": "meeting_exports"
 }
 
+def _parse_bool(value):
+    """Parse a boolean environment variable."""
+    return value.lower() in ('true', '1', 'yes')
+
+# Environment variables that override the configuration: (variable, config key, parser)
+_ENV_MAP = [
+    ('OPENAI_API_KEY', 'openai_api_key', str),
+    ('WHISPER_MODEL', 'whisper_model', str),
+    ('ENABLE_NOTIFICATIONS', 'enable_notifications', _parse_bool),
+    ('SUMMARY_UPDATE_INTERVAL', 'summary_update_interval', int),
+    ('ACTION_ITEMS_UPDATE_INTERVAL', 'action_items_update_interval', int),
+    ('INSIGHT_COOLDOWN', 'insight_cooldown', int),
+    ('EXPORT_DIRECTORY', 'export_directory', str)
+]
+
+# Resolved configuration file path, shared by every Config instance
+_CONFIG_PATH_CACHE = None
+
 class Config:
     def __init__(self):
         """Initialize configuration with default values."""
         self.config = DEFAULT_CONFIG.copy()
         self.config_file = self._get_config_file_path()
         
-        # Load environment variables
-        load_dotenv()
+        # Load environment variables from a .env file in the working directory, if there is one
+        env_path = Path.cwd() / ".env"
+        if env_path.is_file():
+            from dotenv import load_dotenv
+            load_dotenv(env_path)
         
         # Load configuration from file if it exists
         self._load_config_from_file()
@@ -36,6 +58,10 @@ class Config:
         
     def _get_config_file_path(self):
         """Get the configuration file path."""
+        global _CONFIG_PATH_CACHE
+        if _CONFIG_PATH_CACHE is not None:
+            return _CONFIG_PATH_CACHE
+            
         # Get the user's home directory
         home_dir = Path.home()
         
@@ -44,55 +70,32 @@ class Config:
         config_dir.mkdir(exist_ok=True)
         
         # Configuration file path
-        return config_dir / "config.json"
+        _CONFIG_PATH_CACHE = config_dir / "config.json"
+        return _CONFIG_PATH_CACHE
         
     def _load_config_from_file(self):
         """Load configuration from file if it exists."""
-        if self.config_file.exists():
-            try:
-                with open(self.config_file, 'r') as f:
-                    file_config = json.load(f)
-                    # Update config with file values
-                    self.config.update(file_config)
-            except (json.JSONDecodeError, IOError) as e:
-                print(f"Error loading config file: {e}")
+        try:
+            with open(self.config_file, 'r') as f:
+                file_config = json.load(f)
+                # Update config with file values
+                self.config.update(file_config)
+        except FileNotFoundError:
+            return
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Error loading config file: {e}")
                 
     def _load_config_from_env(self):
         """Load configuration from environment variables."""
-        # OpenAI API key
-        if 'OPENAI_API_KEY' in os.environ:
-            self.config['openai_api_key'] = os.environ['OPENAI_API_KEY']
-            
-        # Whisper model
-        if 'WHISPER_MODEL' in os.environ:
-            self.config['whisper_model'] = os.environ['WHISPER_MODEL']
-            
-        # Notifications
-        if 'ENABLE_NOTIFICATIONS' in os.environ:
-            self.config['enable_notifications'] = os.environ['ENABLE_NOTIFICATIONS'].lower() in ('true', '1', 'yes')
-            
-        # Update intervals
-        if 'SUMMARY_UPDATE_INTERVAL' in os.environ:
+        environ_get = os.environ.get
+        for env_name, key, parse in _ENV_MAP:
+            value = environ_get(env_name)
+            if value is None:
+                continue
             try:
-                self.config['summary_update_interval'] = int(os.environ['SUMMARY_UPDATE_INTERVAL'])
+                self.config[key] = parse(value)
             except ValueError:
                 pass
-                
-        if 'ACTION_ITEMS_UPDATE_INTERVAL' in os.environ:
-            try:
-                self.config['action_items_update_interval'] = int(os.environ['ACTION_ITEMS_UPDATE_INTERVAL'])
-            except ValueError:
-                pass
-                
-        if 'INSIGHT_COOLDOWN' in os.environ:
-            try:
-                self.config['insight_cooldown'] = int(os.environ['INSIGHT_COOLDOWN'])
-            except ValueError:
-                pass
-                
-        # Export directory
-        if 'EXPORT_DIRECTORY' in os.environ:
-            self.config['export_directory'] = os.environ['EXPORT_DIRECTORY']
             
     def save_config(self):
         """Save the current configuration to file."""
@@ -141,9 +144,4 @@ class Config:
         Returns:
             Path: Path to export directory
         """
-        export_dir = Path(self.get('export_directory'))
-        
-        # Create the directory if it doesn't exist
-        export_dir.mkdir(exist_ok=True)
-        
-        return export_dir
+        return ensure_export_dir(self.get('export_directory'))
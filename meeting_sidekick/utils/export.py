@@ -3,11 +3,23 @@ Export module for Meeting Sidekick.
 Handles exporting meeting data to various formats.
 """
 
+import dataclasses
 import json
 import os
-from datetime import datetime
+import time
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Export directories already created, keyed by the path they were requested with
+_EXPORT_DIR_CACHE = {}
+
+# Characters that aren't allowed in filenames, mapped to underscores
+_SANITIZE_TABLE = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+
 def sanitize_filename(filename):
     """
     Sanitize a filename by removing invalid characters.
@@ -18,11 +30,25 @@ def sanitize_filename(filename):
     Returns:
         str: Sanitized filename
     """
-    # Replace invalid characters with underscores
-    invalid_chars = '<>:"/\\|?*'
-    for char in invalid_chars:
-        filename = filename.replace(char, '_')
-    return filename
+    # Replace invalid characters with underscores in a single pass
+    return filename.translate(_SANITIZE_TABLE)
+
+def ensure_export_dir(path):
+    """
+    Get an export directory, creating it on first use.
+    
+    Args:
+        path (str): Export directory path
+        
+    Returns:
+        Path: Path to the export directory
+    """
+    export_dir = _EXPORT_DIR_CACHE.get(path)
+    if export_dir is None:
+        export_dir = Path(path)
+        export_dir.mkdir(exist_ok=True)
+        _EXPORT_DIR_CACHE[path] = export_dir
+    return export_dir
 
 def generate_filename(meeting_title, extension):
     """
@@ -36,7 +62,7 @@ def generate_filename(meeting_title, extension):
         str: Generated filename
     """
     # Get current date and time
-    date_str = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    date_str = time.strftime("%Y-%m-%d_%H-%M-%S")
     
     # Sanitize the meeting title
     safe_title = sanitize_filename(meeting_title)
@@ -57,45 +83,37 @@ def export_to_markdown(meeting_data, export_dir):
     """
     # Generate filename
     filename = generate_filename(meeting_data['title'], "md")
-    filepath = export_dir / filename
+    filepath = str(export_dir / filename)
     
-    # Format the markdown content
-    content = f"# {meeting_data['title']}\n\n"
-    content += f"**Date:** {meeting_data['date']}\n\n"
-    
-    # Add summary
-    content += "## Summary\n\n"
-    content += f"{meeting_data['summary']}\n\n"
-    
-    # Add action items
-    content += "## Action Items\n\n"
-    if meeting_data['action_items']:
-        for item in meeting_data['action_items']:
-            person = item.get('person', 'Unassigned')
-            task = item.get('task', 'No task')
-            deadline = item.get('deadline', '')
-            priority = item.get('priority', '')
-            
-            content += f"- **{person}:** {task}"
-            if deadline:
-                content += f" (Deadline: {deadline})"
-            if priority:
-                content += f" [Priority: {priority}]"
-            content += "\n"
-    else:
-        content += "No action items.\n"
-    
-    # Add transcript
-    content += "\n## Full Transcript\n\n"
-    content += "```\n"
-    content += meeting_data['transcript']
-    content += "\n```\n"
-    
-    # Write to file
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(content)
+    # Write each section as it is formatted so the transcript is never copied
+    # into one large string; the larger buffer cuts down on write() calls
+    with open(filepath, 'w', encoding='utf-8', buffering=65536) as f:
+        f.write(f"# {meeting_data['title']}\n\n")
+        f.write(f"**Date:** {meeting_data['date']}\n\n")
         
-    return str(filepath)
+        # Add summary
+        f.write("## Summary\n\n")
+        f.write(f"{meeting_data['summary']}\n\n")
+        
+        # Add action items
+        f.write("## Action Items\n\n")
+        if meeting_data['action_items']:
+            for item in meeting_data['action_items']:
+                line = f"- **{item.person or 'Unassigned'}:** {item.task or 'No task'}"
+                if item.deadline:
+                    line += f" (Deadline: {item.deadline})"
+                if item.priority:
+                    line += f" [Priority: {item.priority}]"
+                f.write(line + "\n")
+        else:
+            f.write("No action items.\n")
+        
+        # Add transcript
+        f.write("\n## Full Transcript\n\n```\n")
+        f.write(meeting_data['transcript'])
+        f.write("\n```\n")
+        
+    return filepath
 
 def export_to_json(meeting_data, export_dir):
     """
@@ -110,13 +128,18 @@ def export_to_json(meeting_data, export_dir):
     """
     # Generate filename
     filename = generate_filename(meeting_data['title'], "json")
-    filepath = export_dir / filename
+    filepath = str(export_dir / filename)
     
-    # Write to file
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(meeting_data, f, indent=2)
+    # Write to file; orjson produces UTF-8 bytes directly and serializes
+    # the action item dataclasses natively
+    if orjson is not None:
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(meeting_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(meeting_data, f, indent=2, default=dataclasses.asdict)
         
-    return str(filepath)
+    return filepath
 
 def export_to_file(meeting_data, output_format="markdown"):
     """
@@ -129,9 +152,8 @@ def export_to_file(meeting_data, output_format="markdown"):
     Returns:
         str: Path to the exported file
     """
-    # Create the export directory if it doesn't exist
-    export_dir = Path("meeting_exports")
-    export_dir.mkdir(exist_ok=True)
+    # Create the export directory on the first export
+    export_dir = ensure_export_dir("meeting_exports")
     
     # Export based on the format
     if output_format.lower() == "json":
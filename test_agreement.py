@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for the Local Agreement streaming policy.
+"""
+
+import unittest
+from meeting_sidekick.audio.agreement import LocalAgreement
+
+def words(*triples):
+    """Build (word, start_time, end_time, probability) tuples from (word, start_time, end_time) triples."""
+    return [(word, start, end, 1.0) for word, start, end in triples]
+
+def text(committed):
+    """Join committed word tuples the way the recognizer does."""
+    return "".join(word[0] for word in committed).strip()
+
+class TestLocalAgreement(unittest.TestCase):
+    def setUp(self):
+        self.agreement = LocalAgreement()
+        
+    def test_first_hypothesis_commits_nothing(self):
+        """A single hypothesis has nothing to agree with"""
+        self.assertEqual(self.agreement.update(words((" hello", 0.1, 0.5))), [])
+        
+    def test_commits_agreed_prefix(self):
+        """Words two consecutive hypotheses share are committed once"""
+        self.agreement.update(words((" hello", 0.1, 0.5), (" word", 0.6, 0.9)))
+        committed = self.agreement.update(words((" Hello", 0.1, 0.5), (" world", 0.6, 0.9), (" again", 1.0, 1.3)))
+        self.assertEqual(text(committed), "Hello")
+        self.assertEqual(self.agreement.committed_end, 0.5)
+        
+        committed = self.agreement.update(words((" hello", 0.1, 0.5), (" world", 0.6, 0.9), (" again", 1.0, 1.3)))
+        self.assertEqual(text(committed), "world again")
+        
+    def test_flush_after_words_were_merged(self):
+        """A later decode that splits the committed audio differently loses no words"""
+        self.agreement.update(words((" Um,", 0.0, 0.3), (" hello", 0.3, 0.6), (" world", 0.6, 1.0)))
+        self.agreement.update(words((" Um,", 0.0, 0.3), (" hello", 0.3, 0.6), (" world", 0.6, 1.0)))
+        
+        committed = self.agreement.flush(words((" Hello", 0.0, 0.6), (" world", 0.6, 1.0),
+                                               (" again", 1.0, 1.4), (" friends", 1.4, 1.8)))
+        self.assertEqual(text(committed), "again friends")
+        
+    def test_update_after_words_were_split(self):
+        """A later decode with more words over the committed audio emits no duplicates"""
+        self.agreement.update(words((" hello", 0.1, 0.6), (" world", 0.6, 1.0)))
+        self.agreement.update(words((" hello", 0.1, 0.6), (" world", 0.6, 1.0)))
+        
+        hypothesis = words((" he", 0.1, 0.3), (" llo", 0.3, 0.6), (" world", 0.6, 1.0), (" again", 1.0, 1.4))
+        self.agreement.update(hypothesis)
+        committed = self.agreement.update(hypothesis)
+        self.assertEqual(text(committed), "again")
+        
+    def test_jittered_timestamps_are_not_recommitted(self):
+        """Word timings that shift between decodes don't emit committed words again"""
+        emitted = []
+        emitted += self.agreement.update(words((" hello", 0.10, 0.50), (" world", 0.55, 0.90)))
+        emitted += self.agreement.update(words((" hello", 0.12, 0.52), (" world", 0.57, 0.92), (" again", 1.00, 1.30)))
+        emitted += self.agreement.update(words((" hello", 0.08, 0.48), (" world", 0.55, 0.95),
+                                               (" again", 1.02, 1.32), (" friends", 1.35, 1.70)))
+        self.assertEqual(text(emitted), "hello world again")
+        
+        emitted += self.agreement.flush(words((" hello", 0.11, 0.49), (" world", 0.56, 0.93), (" again", 0.99, 1.35),
+                                              (" friends", 1.38, 1.72), (" bye", 1.80, 2.00)))
+        self.assertEqual(text(emitted), "hello world again friends bye")
+        
+    def test_jittered_flush_after_partial_commit(self):
+        """A final decode whose timings moved earlier still emits only the new words"""
+        self.agreement.update(words((" one", 0.0, 0.40), (" two", 0.45, 0.80)))
+        self.agreement.update(words((" one", 0.0, 0.42), (" two", 0.47, 0.82)))
+        
+        committed = self.agreement.flush(words((" one", 0.0, 0.38), (" two", 0.43, 0.78), (" three", 0.85, 1.20)))
+        self.assertEqual(text(committed), "three")
+        
+    def test_flush_resets(self):
+        """Flushing starts a new buffer with nothing committed"""
+        self.agreement.update(words((" hello", 0.1, 0.5)))
+        self.agreement.flush(words((" hello", 0.1, 0.5)))
+        self.assertEqual(self.agreement.committed, 0)
+        self.assertEqual(self.agreement.committed_end, 0.0)
+        
+if __name__ == "__main__":
+    unittest.main()
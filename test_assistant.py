@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Tests for transcript bookkeeping in the meeting assistant.
+"""
+
+import unittest
+from meeting_sidekick.processing.assistant import MeetingAssistant
+
+class TestReviseTranscript(unittest.TestCase):
+    def setUp(self):
+        # Skip the OpenAI client and event loop; revising only touches the transcript
+        self.assistant = MeetingAssistant.__new__(MeetingAssistant)
+        self.assistant.meeting_transcript = []
+        self.assistant._joined_cache = {}
+        
+    def test_revises_line_by_position(self):
+        """A repeated line is revised where the recognizer refined it, not where the text first appears"""
+        self.assistant.meeting_transcript = ["Okay.\nfoo", "bar\nOkay."]
+        self.assistant.revise_transcript([(3, "Okay, thanks.")])
+        self.assertEqual(self.assistant.meeting_transcript, ["Okay.\nfoo", "bar\nOkay, thanks."])
+        
+    def test_revises_across_batched_segments(self):
+        """Lines are counted across segments, whether or not they were batched"""
+        self.assistant.meeting_transcript = ["one", "two\nthree\nfour", "five"]
+        self.assistant.revise_transcript([(0, "One"), (2, "Three"), (4, "Five")])
+        self.assertEqual(self.assistant.meeting_transcript, ["One", "two\nThree\nfour", "Five"])
+        
+    def test_revision_reaches_joined_transcript(self):
+        """The full transcript reflects the revision even after it was cached"""
+        self.assistant.meeting_transcript = ["hello", "wrold"]
+        self.assertEqual(self.assistant.get_full_transcript(), "hello\nwrold")
+        self.assistant.revise_transcript([(1, "world")])
+        self.assertEqual(self.assistant.get_full_transcript(), "hello\nworld")
+        
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for batched re-decoding and transcript refinement in the speech recognizer.
+"""
+
+import unittest
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from meeting_sidekick.audio.recorder import SAMPLE_RATE, SpeechRecognizer
+
+Segment = namedtuple("Segment", ["start", "text"])
+
+class FakeBatchedPipeline:
+    """
+    Stand-in for faster-whisper 1.2's BatchedInferencePipeline.
+    
+    Like the real pipeline, it converts clip_timestamps from seconds to samples,
+    joins consecutive clips into chunks of up to 30 seconds and, with timestamps
+    off, returns one segment per chunk that starts at the chunk's first clip.
+    Each window is "decoded" to the marker its samples were filled with.
+    """
+    def transcribe(self, audio, batch_size, vad_filter, clip_timestamps):
+        chunks, current, duration = [], [], 0
+        for clip in clip_timestamps:
+            start, end = int(clip["start"] * SAMPLE_RATE), int(clip["end"] * SAMPLE_RATE)
+            if current and duration + end - start > 30 * SAMPLE_RATE:
+                chunks.append(current)
+                current, duration = [], 0
+            current.append((start, end))
+            duration += end - start
+        if current:
+            chunks.append(current)
+            
+        segments = []
+        for chunk in chunks:
+            words = [self._decode(audio[start:end]) for start, end in chunk]
+            segments.append(Segment(round(chunk[0][0] / SAMPLE_RATE, 3), " ".join(word for word in words if word)))
+        return iter(segments), None
+        
+    def _decode(self, audio):
+        speech = audio[audio != 0]
+        return f"window{int(round(speech[0] * 100))}" if speech.size else ""
+
+def window(marker, seconds):
+    """Build a window whose samples all hold the marker the fake pipeline decodes."""
+    return np.full(int(seconds * SAMPLE_RATE), marker / 100, dtype=np.float32)
+
+class TestBulkTranscribe(unittest.TestCase):
+    def setUp(self):
+        # Skip model loading; bulk_transcribe only needs the pipeline and the inference worker
+        self.recognizer = SpeechRecognizer.__new__(SpeechRecognizer)
+        self.recognizer._batched = FakeBatchedPipeline()
+        self.recognizer._infer_pool = ThreadPoolExecutor(max_workers=1)
+        
+    def tearDown(self):
+        self.recognizer._infer_pool.shutdown()
+        
+    def test_short_windows_keep_their_own_text(self):
+        """Windows that fit in one 30 second chunk together are still decoded separately"""
+        windows = [window(1, 3.2), window(2, 4.1), window(3, 2.5), window(4, 5.0)]
+        self.assertEqual(self.recognizer.bulk_transcribe(windows),
+                         ["window1", "window2", "window3", "window4"])
+        
+    def test_no_windows(self):
+        """Nothing to decode returns no text"""
+        self.assertEqual(self.recognizer.bulk_transcribe([]), [])
+        
+    def test_refine_reports_replaced_indices(self):
+        """Refined text replaces the uncertain segments and is reported by index"""
+        self.recognizer.transcription = ["Okay.", "hello", "Okay.", "bye"]
+        self.recognizer._uncertain = [(2, window(1, 1.5)), (3, window(2, 2.0))]
+        
+        self.assertEqual(self.recognizer.refine_transcript(), [(2, "window1"), (3, "window2")])
+        self.assertEqual(self.recognizer.transcription, ["Okay.", "hello", "window1", "window2"])
+        self.assertEqual(self.recognizer._uncertain, [])
+        
+if __name__ == "__main__":
+    unittest.main()